@@ -3,16 +3,20 @@
 KDP Maze Book Generator - Creates a 100-page maze workbook based on 5 Stages of Learning
 """
 import argparse
+import functools
+import io
 import json
 import os
 import random
-from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from typing import Dict, List, Optional, Tuple
 
+import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import letter
+from reportlab.lib.utils import ImageReader
 import math
 
 try:
@@ -35,86 +39,138 @@ Cell = Tuple[int, int]
 
 LEGEND = {"start": "dot", "finish": "star", "size_rel": 0.33}
 
+# Unit vectors to the 10 alternating outer/inner points of the FINISH star, starting straight up
+_STAR_UNIT = tuple((math.cos(i * math.pi / 5 - math.pi / 2), math.sin(i * math.pi / 5 - math.pi / 2))
+                   for i in range(10))
+
+# Wall bits stored per cell in Maze.walls
+N_BIT, S_BIT, E_BIT, W_BIT = 1, 2, 4, 8
+ALL_WALLS = N_BIT | S_BIT | E_BIT | W_BIT
+
 @dataclass
 class Maze:
+    __slots__ = ("width", "height", "walls")
     width: int
     height: int
-    cells: Dict[Cell, Dict[str, bool]]
+    walls: np.ndarray  # uint8, shape (height, width); a set bit means the wall is present
+    
+    def __eq__(self, other: object) -> bool:
+        # The generated __eq__ would compare walls with ==, which is ambiguous for arrays
+        if not isinstance(other, Maze):
+            return NotImplemented
+        return (self.width == other.width and self.height == other.height
+                and np.array_equal(self.walls, other.walls))
     
     @classmethod
     def create(cls, width: int, height: int, seed: Optional[int] = None) -> "Maze":
-        if seed is not None:
-            random.seed(seed)
-        cells = {}
-        for x in range(width):
-            for y in range(height):
-                cells[(x, y)] = {"N": True, "S": True, "E": True, "W": True}
-        m = cls(width=width, height=height, cells=cells)
-        m._generate()
+        walls = np.full((height, width), ALL_WALLS, dtype=np.uint8)
+        m = cls(width=width, height=height, walls=walls)
+        m._generate(random.Random(seed))
         return m
     
-    def _generate(self) -> None:
-        start = (0, 0)
-        stack: List[Cell] = [start]
-        visited = {start}
+    def _generate(self, rng: random.Random) -> None:
+        # Recursive backtracker over flat cell indices i = y * width + x. Works on a bytearray
+        # copy of the wall grid and writes it back once at the end.
+        width, height = self.width, self.height
+        cells = bytearray(self.walls.tobytes())
+        visited = bytearray(width * height)
+        visited[0] = 1
+        stack: List[int] = [0]
+        randrange = rng.randrange
+        # (index delta, wall on current cell, wall on neighbour) for N, S, E, W
+        north = (-width, N_BIT, S_BIT)
+        south = (width, S_BIT, N_BIT)
+        east = (1, E_BIT, W_BIT)
+        west = (-1, W_BIT, E_BIT)
         while stack:
-            current = stack[-1]
+            i = stack[-1]
+            x = i % width
+            y = i // width
             neighbors = []
-            x, y = current
-            cand = [((x, y - 1), "N", "S"), ((x, y + 1), "S", "N"),
-                    ((x + 1, y), "E", "W"), ((x - 1, y), "W", "E")]
-            for (nx, ny), dir_from_cur, dir_from_nb in cand:
-                if 0 <= nx < self.width and 0 <= ny < self.height and (nx, ny) not in visited:
-                    neighbors.append(((nx, ny), dir_from_cur, dir_from_nb))
+            if y > 0 and not visited[i - width]:
+                neighbors.append(north)
+            if y < height - 1 and not visited[i + width]:
+                neighbors.append(south)
+            if x < width - 1 and not visited[i + 1]:
+                neighbors.append(east)
+            if x > 0 and not visited[i - 1]:
+                neighbors.append(west)
             if neighbors:
-                (nx, ny), dcur, dnb = random.choice(neighbors)
-                self.cells[current][dcur] = False
-                self.cells[(nx, ny)][dnb] = False
-                visited.add((nx, ny))
-                stack.append((nx, ny))
+                delta, dcur, dnb = neighbors[randrange(len(neighbors))]
+                j = i + delta
+                cells[i] &= ALL_WALLS ^ dcur
+                cells[j] &= ALL_WALLS ^ dnb
+                visited[j] = 1
+                stack.append(j)
             else:
                 stack.pop()
+        self.walls[:] = np.frombuffer(cells, dtype=np.uint8).reshape(height, width)
     
     def neighbors_open(self, cell: Cell) -> List[Cell]:
         x, y = cell
+        w = self.walls[y, x]
         res: List[Cell] = []
-        if not self.cells[cell]["N"] and y - 1 >= 0:
+        if not w & N_BIT and y - 1 >= 0:
             res.append((x, y - 1))
-        if not self.cells[cell]["S"] and y + 1 < self.height:
+        if not w & S_BIT and y + 1 < self.height:
             res.append((x, y + 1))
-        if not self.cells[cell]["E"] and x + 1 < self.width:
+        if not w & E_BIT and x + 1 < self.width:
             res.append((x + 1, y))
-        if not self.cells[cell]["W"] and x - 1 >= 0:
+        if not w & W_BIT and x - 1 >= 0:
             res.append((x - 1, y))
         return res
     
     def solve_bfs(self, start: Cell = (0, 0), goal: Optional[Cell] = None) -> List[Cell]:
         if goal is None:
             goal = (self.width - 1, self.height - 1)
-        queue = deque([start])
-        came_from: Dict[Cell, Optional[Cell]] = {start: None}
-        while queue:
-            cur = queue.popleft()
-            if cur == goal:
-                break
-            for nb in self.neighbors_open(cur):
-                if nb not in came_from:
-                    came_from[nb] = cur
-                    queue.append(nb)
+        # Level-synchronous BFS over flat cell indices i = y * width + x: every iteration
+        # expands the whole frontier at once with array operations
+        width = self.width
+        flat = self.walls.ravel()
+        start_idx = start[1] * width + start[0]
+        goal_idx = goal[1] * width + goal[0]
+        parent = np.full(flat.size, -1, dtype=np.int32)
+        parent[start_idx] = start_idx
+        frontier = np.array([start_idx], dtype=np.int32)
+        while frontier.size and parent[goal_idx] == -1:
+            cell_walls = flat[frontier]
+            cols = frontier % width
+            moves = ((-width, N_BIT, frontier >= width),
+                     (width, S_BIT, frontier < flat.size - width),
+                     (1, E_BIT, cols < width - 1),
+                     (-1, W_BIT, cols > 0))
+            srcs = [frontier[inside & ((cell_walls & bit) == 0)] for _, bit, inside in moves]
+            nxt = np.concatenate([src + delta for src, (delta, _, _) in zip(srcs, moves)])
+            src = np.concatenate(srcs)
+            fresh = parent[nxt] == -1
+            nxt, src = nxt[fresh], src[fresh]
+            parent[nxt] = src
+            frontier = np.unique(nxt)
+        if parent[goal_idx] == -1:
+            return [goal]
+        parents = parent.tolist()
         path: List[Cell] = []
-        cur: Optional[Cell] = goal
-        while cur is not None:
-            path.append(cur)
-            cur = came_from.get(cur)
+        i = goal_idx
+        while i != start_idx:
+            path.append((i % width, i // width))
+            i = parents[i]
+        path.append(start)
         path.reverse()
         return path
 
+@functools.lru_cache(maxsize=32)
 def get_font(size: int = 24):
     try:
         return ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", size)
     except:
         return ImageFont.load_default()
 
+@functools.lru_cache(maxsize=256)
+def _text_width(font, text: str) -> int:
+    """Rendered width of text, for centering. Keyed on the font object, which get_font keeps alive."""
+    bbox = font.getbbox(text)
+    return bbox[2] - bbox[0]
+
 def draw_marker(draw, cell_center, marker_type, cell_size):
     """Draw START (●) or FINISH (★) marker at cell center"""
     x, y = cell_center
@@ -123,21 +179,84 @@ def draw_marker(draw, cell_center, marker_type, cell_size):
     if marker_type == "dot":
         # Draw filled circle for START
         radius = size // 2
-        draw.ellipse([(x - radius, y - radius), (x + radius, y + radius)], fill="black")
+        draw.ellipse([(x - radius, y - radius), (x + radius, y + radius)], fill=0)
     elif marker_type == "star":
         # Draw 5-point star for FINISH
         radius = size // 2
         points = []
-        for i in range(10):
-            angle = i * math.pi / 5
+        for i, (ux, uy) in enumerate(_STAR_UNIT):
             r = radius if i % 2 == 0 else radius // 2
-            px = x + r * math.cos(angle - math.pi / 2)
-            py = y + r * math.sin(angle - math.pi / 2)
-            points.append((px, py))
-        draw.polygon(points, fill="black")
+            points.append((x + r * ux, y + r * uy))
+        draw.polygon(points, fill=0)
+
+@functools.lru_cache(maxsize=16)
+def _full_grid(rows: int, cols: int, cell_size: int, wall_width: int, shade: int) -> np.ndarray:
+    """Every wall of a rows x cols grid laid out as in render_walls. Read-only; callers copy it."""
+    arr = np.full((rows * cell_size + wall_width, cols * cell_size + wall_width), 255, dtype=np.uint8)
+    for k in range(wall_width):
+        arr[k::cell_size] = shade
+        arr[:, k::cell_size] = shade
+    arr.flags.writeable = False
+    return arr
+
+def _erase_open_segments(arr: np.ndarray, open_edges: np.ndarray, cell_size: int, wall_width: int) -> None:
+    """Erase open segments lying on horizontal grid lines of arr (pass arr.T for vertical lines).
+
+    open_edges[r, c] marks the segment of grid line r that spans cell c. Only the part of
+    the segment between its two corner squares is cleared.
+    """
+    rows, cols = open_edges.shape
+    mask = np.repeat(open_edges, cell_size, axis=1)
+    for k in range(wall_width):
+        mask[:, k::cell_size] = False
+    for k in range(wall_width):
+        arr[k::cell_size][:rows, :cols * cell_size][mask] = 255
+
+def _wall_array(maze: Maze, cell_size: int, wall_width: int, shade: int) -> np.ndarray:
+    """Render the maze walls as a uint8 array on white, with the grid origin at
+    ((wall_width - 1) // 2, (wall_width - 1) // 2) to match ImageDraw's line placement."""
+    walls = maze.walls
+    arr = _full_grid(maze.height, maze.width, cell_size, wall_width, shade).copy()
+    # Start from the cached all-walls grid and erase the open passages. Each interior wall is
+    # stored on both cells that share it, so a segment is open only if neither side has it.
+    # Horizontal grid lines 0..height:
+    h_walls = np.zeros((maze.height + 1, maze.width), dtype=bool)
+    h_walls[:-1] |= (walls & N_BIT) != 0
+    h_walls[1:] |= (walls & S_BIT) != 0
+    _erase_open_segments(arr, ~h_walls, cell_size, wall_width)
+    # Vertical grid lines 0..width, erased through the transposed view
+    v_walls = np.zeros((maze.width + 1, maze.height), dtype=bool)
+    v_walls[:-1] |= (walls & W_BIT).T != 0
+    v_walls[1:] |= (walls & E_BIT).T != 0
+    _erase_open_segments(arr.T, ~v_walls, cell_size, wall_width)
+    # Corner squares with no wall on any side (never the case in a perfect maze)
+    touched = np.zeros((maze.height + 1, maze.width + 1), dtype=bool)
+    touched[:, :-1] |= h_walls
+    touched[:, 1:] |= h_walls
+    touched[:-1] |= v_walls.T
+    touched[1:] |= v_walls.T
+    if not touched.all():
+        for ky in range(wall_width):
+            for kx in range(wall_width):
+                arr[ky::cell_size, kx::cell_size][~touched] = 255
+    return arr
+
+def render_walls(maze: Maze, cell_size: int, wall_width: int, shade: int) -> Image.Image:
+    """_wall_array as an "L" image."""
+    return Image.fromarray(_wall_array(maze, cell_size, wall_width, shade))
+
+def _paint_segments(arr: np.ndarray, points: List[Tuple[int, int]], width: int, shade: int) -> None:
+    """Paint the axis-aligned polyline through points into arr, centred on each point the way
+    ImageDraw.line centres wide lines. Every segment also covers the square at both of its
+    ends, so turns are filled in."""
+    off = (width - 1) // 2
+    for (x0, y0), (x1, y1) in zip(points, points[1:]):
+        x0, x1 = min(x0, x1) - off, max(x0, x1) - off
+        y0, y1 = min(y0, y1) - off, max(y0, y1) - off
+        arr[y0:y1 + width, x0:x1 + width] = shade
 
 def draw_maze_page(maze: Maze, puzzle_num: int, stage: int, canvas_size: Tuple[int, int], margin: int) -> Image.Image:
-    img = Image.new("RGB", canvas_size, "white")
+    img = Image.new("L", canvas_size, 255)
     draw = ImageDraw.Draw(img)
     
     # Calculate maze area with extra margin for trim safety
@@ -152,28 +271,18 @@ def draw_maze_page(maze: Maze, puzzle_num: int, stage: int, canvas_size: Tuple[i
     # Center maze
     start_x = safe_margin + (maze_width - maze_pixel_width) // 2
     start_y = safe_margin + (maze_height - maze_pixel_height) // 2
+    xs = [start_x + x * cell_size for x in range(maze.width + 1)]
+    ys = [start_y + y * cell_size for y in range(maze.height + 1)]
+    half = cell_size // 2
     
     # Draw maze walls
     wall_width = max(2, cell_size // 15)
-    for x in range(maze.width):
-        for y in range(maze.height):
-            cx = start_x + x * cell_size
-            cy = start_y + y * cell_size
-            cell = (x, y)
-            
-            if maze.cells[cell]["N"]:
-                draw.line([(cx, cy), (cx + cell_size, cy)], fill="black", width=wall_width)
-            if maze.cells[cell]["S"]:
-                draw.line([(cx, cy + cell_size), (cx + cell_size, cy + cell_size)], fill="black", width=wall_width)
-            if maze.cells[cell]["W"]:
-                draw.line([(cx, cy), (cx, cy + cell_size)], fill="black", width=wall_width)
-            if maze.cells[cell]["E"]:
-                draw.line([(cx + cell_size, cy), (cx + cell_size, cy + cell_size)], fill="black", width=wall_width)
+    offset = (wall_width - 1) // 2
+    img.paste(render_walls(maze, cell_size, wall_width, 0), (start_x - offset, start_y - offset))
     
     # Draw START and FINISH markers
-    start_center = (start_x + cell_size // 2, start_y + cell_size // 2)
-    end_center = (start_x + (maze.width - 1) * cell_size + cell_size // 2, 
-                  start_y + (maze.height - 1) * cell_size + cell_size // 2)
+    start_center = (xs[0] + half, ys[0] + half)
+    end_center = (xs[-2] + half, ys[-2] + half)
     
     draw_marker(draw, start_center, LEGEND["start"], cell_size)
     draw_marker(draw, end_center, LEGEND["finish"], cell_size)
@@ -181,21 +290,32 @@ def draw_maze_page(maze: Maze, puzzle_num: int, stage: int, canvas_size: Tuple[i
     # Add title at bottom (0.4 inches from bottom margin)
     font = get_font(48)  # Larger, more legible font (16pt equivalent at 300 DPI)
     title = f"Puzzle {puzzle_num} • Stage {stage}"
-    bbox = draw.textbbox((0, 0), title, font=font)
-    text_width = bbox[2] - bbox[0]
+    text_width = _text_width(font, title)
     text_x = (canvas_size[0] - text_width) // 2
     text_y = canvas_size[1] - margin - int(0.4 * 300)  # 0.4 inches from bottom margin
-    draw.text((text_x, text_y), title, fill="black", font=font)
+    draw.text((text_x, text_y), title, fill=0, font=font)
     
     return img
 
-def draw_key_page(maze: Maze, puzzle_num: int, stage: int, canvas_size: Tuple[int, int], margin: int) -> Image.Image:
-    img = Image.new("RGB", canvas_size, "white")
-    draw = ImageDraw.Draw(img)
+def key_tile_size(canvas_size: Tuple[int, int]) -> Tuple[int, int]:
+    """Size of one key thumbnail on a 4-up key page."""
+    return canvas_size[0] // 2 - 60, canvas_size[1] // 2 - 60
+
+def draw_key_page(maze: Maze, puzzle_num: int, stage: int, canvas_size: Tuple[int, int], margin: int,
+                  target_size: Optional[Tuple[int, int]] = None) -> Image.Image:
+    # With target_size, render the canvas_size layout directly at that size (e.g. a 4-up tile)
+    # instead of rendering full size and downsampling
+    label_space = 60
+    if target_size is not None:
+        scale = min(target_size[0] / canvas_size[0], target_size[1] / canvas_size[1])
+        margin = int(margin * scale)
+        label_space = int(label_space * scale)
+        canvas_size = target_size
+    arr = np.full((canvas_size[1], canvas_size[0]), 255, dtype=np.uint8)
     
     # Calculate maze area (smaller for key)
     maze_width = canvas_size[0] - 2 * margin
-    maze_height = canvas_size[1] - 2 * margin - 60
+    maze_height = canvas_size[1] - 2 * margin - label_space
     
     cell_size = min(maze_width // maze.width, maze_height // maze.height)
     maze_pixel_width = maze.width * cell_size
@@ -203,40 +323,28 @@ def draw_key_page(maze: Maze, puzzle_num: int, stage: int, canvas_size: Tuple[in
     
     start_x = margin + (maze_width - maze_pixel_width) // 2
     start_y = margin + (maze_height - maze_pixel_height) // 2
+    xs = [start_x + x * cell_size for x in range(maze.width + 1)]
+    ys = [start_y + y * cell_size for y in range(maze.height + 1)]
+    half = cell_size // 2
     
     # Draw faint maze walls
     wall_width = max(1, cell_size // 20)
-    for x in range(maze.width):
-        for y in range(maze.height):
-            cx = start_x + x * cell_size
-            cy = start_y + y * cell_size
-            cell = (x, y)
-            
-            if maze.cells[cell]["N"]:
-                draw.line([(cx, cy), (cx + cell_size, cy)], fill="gray", width=wall_width)
-            if maze.cells[cell]["S"]:
-                draw.line([(cx, cy + cell_size), (cx + cell_size, cy + cell_size)], fill="gray", width=wall_width)
-            if maze.cells[cell]["W"]:
-                draw.line([(cx, cy), (cx, cy + cell_size)], fill="gray", width=wall_width)
-            if maze.cells[cell]["E"]:
-                draw.line([(cx + cell_size, cy), (cx + cell_size, cy + cell_size)], fill="gray", width=wall_width)
+    offset = (wall_width - 1) // 2
+    walls = _wall_array(maze, cell_size, wall_width, 128)
+    arr[start_y - offset:start_y - offset + walls.shape[0], start_x - offset:start_x - offset + walls.shape[1]] = walls
     
     # Draw solution path
     path = maze.solve_bfs()
     if len(path) > 1:
-        path_points = []
-        for x, y in path:
-            px = start_x + x * cell_size + cell_size // 2
-            py = start_y + y * cell_size + cell_size // 2
-            path_points.append((px, py))
-        
-        for i in range(len(path_points) - 1):
-            draw.line([path_points[i], path_points[i + 1]], fill="black", width=max(2, cell_size // 10))
+        path_points = [(xs[x] + half, ys[y] + half) for x, y in path]
+        _paint_segments(arr, path_points, max(2, cell_size // 10), 0)
+    
+    img = Image.fromarray(arr)
+    draw = ImageDraw.Draw(img)
     
     # Re-draw markers on top of solution path
-    start_center = (start_x + cell_size // 2, start_y + cell_size // 2)
-    end_center = (start_x + (maze.width - 1) * cell_size + cell_size // 2, 
-                  start_y + (maze.height - 1) * cell_size + cell_size // 2)
+    start_center = (xs[0] + half, ys[0] + half)
+    end_center = (xs[-2] + half, ys[-2] + half)
     
     draw_marker(draw, start_center, LEGEND["start"], cell_size)
     draw_marker(draw, end_center, LEGEND["finish"], cell_size)
@@ -244,8 +352,7 @@ def draw_key_page(maze: Maze, puzzle_num: int, stage: int, canvas_size: Tuple[in
     return img
 
 def draw_diy_page(page_num: int, canvas_size: Tuple[int, int], margin: int) -> Image.Image:
-    img = Image.new("RGB", canvas_size, "white")
-    draw = ImageDraw.Draw(img)
+    arr = np.full((canvas_size[1], canvas_size[0]), 255, dtype=np.uint8)
     
     # Create partial 10x10 maze
     grid_size = 10
@@ -258,36 +365,33 @@ def draw_diy_page(page_num: int, canvas_size: Tuple[int, int], margin: int) -> I
     
     start_x = margin + (maze_width - maze_pixel_width) // 2
     start_y = margin + 50 + (maze_height - maze_pixel_height) // 2
+    xs = [start_x + i * cell_size for i in range(grid_size + 1)]
+    ys = [start_y + i * cell_size for i in range(grid_size + 1)]
+    half = cell_size // 2
     
     # Draw grid
-    for i in range(grid_size + 1):
-        # Vertical lines
-        x = start_x + i * cell_size
-        draw.line([(x, start_y), (x, start_y + maze_pixel_height)], fill="lightgray", width=1)
-        # Horizontal lines
-        y = start_y + i * cell_size
-        draw.line([(start_x, y), (start_x + maze_pixel_width, y)], fill="lightgray", width=1)
+    arr[start_y:ys[-1] + 1, xs] = 211  # Vertical lines
+    arr[ys, start_x:xs[-1] + 1] = 211  # Horizontal lines
     
     # Add some random walls to get started
-    random.seed(42 + page_num)
+    rng = random.Random(42 + page_num)
     wall_width = max(2, cell_size // 15)
     for _ in range(grid_size * 2):  # Add some walls
-        x = random.randint(0, grid_size - 1)
-        y = random.randint(0, grid_size - 1)
-        wall_type = random.choice(["N", "E"])
-        
-        cx = start_x + x * cell_size
-        cy = start_y + y * cell_size
+        x = rng.randint(0, grid_size - 1)
+        y = rng.randint(0, grid_size - 1)
+        wall_type = rng.choice(["N", "E"])
         
         if wall_type == "N" and y > 0:
-            draw.line([(cx, cy), (cx + cell_size, cy)], fill="black", width=wall_width)
+            _paint_segments(arr, [(xs[x], ys[y]), (xs[x + 1], ys[y])], wall_width, 0)
         elif wall_type == "E" and x < grid_size - 1:
-            draw.line([(cx + cell_size, cy), (cx + cell_size, cy + cell_size)], fill="black", width=wall_width)
+            _paint_segments(arr, [(xs[x + 1], ys[y]), (xs[x + 1], ys[y + 1])], wall_width, 0)
+    
+    img = Image.fromarray(arr)
+    draw = ImageDraw.Draw(img)
     
     # Draw START and FINISH markers
-    start_center = (start_x + cell_size // 2, start_y + cell_size // 2)
-    end_center = (start_x + (grid_size - 1) * cell_size + cell_size // 2, 
-                  start_y + (grid_size - 1) * cell_size + cell_size // 2)
+    start_center = (xs[0] + half, ys[0] + half)
+    end_center = (xs[-2] + half, ys[-2] + half)
     
     draw_marker(draw, start_center, LEGEND["start"], cell_size)
     draw_marker(draw, end_center, LEGEND["finish"], cell_size)
@@ -297,26 +401,23 @@ def draw_diy_page(page_num: int, canvas_size: Tuple[int, int], margin: int) -> I
     font_tip = get_font(24)
     
     title = f"Design Your Own Maze D{page_num:02d}"
-    bbox = draw.textbbox((0, 0), title, font=font_title)
-    text_width = bbox[2] - bbox[0]
+    text_width = _text_width(font_title, title)
     text_x = (canvas_size[0] - text_width) // 2
-    draw.text((text_x, margin), title, fill="black", font=font_title)
+    draw.text((text_x, margin), title, fill=0, font=font_title)
     
     tip = "Add walls to create fun dead ends, but always keep a clear path from ● to ★."
-    bbox = draw.textbbox((0, 0), tip, font=font_tip)
-    text_width = bbox[2] - bbox[0]
+    text_width = _text_width(font_tip, tip)
     text_x = (canvas_size[0] - text_width) // 2
     text_y = canvas_size[1] - margin - 40
-    draw.text((text_x, text_y), tip, fill="black", font=font_tip)
+    draw.text((text_x, text_y), tip, fill=0, font=font_tip)
     
     return img
 
 def create_4up_key_page(keys: List[Tuple[int, int, Image.Image]], canvas_size: Tuple[int, int]) -> Image.Image:
-    img = Image.new("RGB", canvas_size, "white")
+    img = Image.new("L", canvas_size, 255)
     
     # Calculate positions for 2x2 grid
-    key_width = canvas_size[0] // 2 - 60
-    key_height = canvas_size[1] // 2 - 60
+    key_width, key_height = key_tile_size(canvas_size)
     
     positions = [
         (30, 30),  # Top-left
@@ -329,39 +430,43 @@ def create_4up_key_page(keys: List[Tuple[int, int, Image.Image]], canvas_size: T
         if i >= 4:
             break
         
-        # Resize key image to fit
-        resized_key = key_img.resize((key_width, key_height), Image.Resampling.LANCZOS)
-        img.paste(resized_key, positions[i])
+        # Keys rendered at tile size (draw_key_page target_size) are pasted as-is
+        if key_img.size != (key_width, key_height):
+            key_img = key_img.resize((key_width, key_height), Image.Resampling.LANCZOS)
+        img.paste(key_img, positions[i])
         
         # Add label
         draw = ImageDraw.Draw(img)
         font = get_font(24)
         label = f"Puzzle {puzzle_num}"
-        bbox = draw.textbbox((0, 0), label, font=font)
-        text_width = bbox[2] - bbox[0]
+        text_width = _text_width(font, label)
         label_x = positions[i][0] + (key_width - text_width) // 2
         label_y = positions[i][1] + key_height + 10
-        draw.text((label_x, label_y), label, fill="black", font=font)
+        draw.text((label_x, label_y), label, fill=0, font=font)
     
     return img
 
 def create_blank_intro_page(canvas_size: Tuple[int, int]) -> Image.Image:
-    img = Image.new("RGB", canvas_size, "white")
+    img = Image.new("L", canvas_size, 255)
     draw = ImageDraw.Draw(img)
     
     # Add legend to intro page
     font = get_font(48)
     legend_text = "Legend: ● START ★ FINISH"
-    bbox = draw.textbbox((0, 0), legend_text, font=font)
-    text_width = bbox[2] - bbox[0]
+    text_width = _text_width(font, legend_text)
     text_x = (canvas_size[0] - text_width) // 2
     text_y = canvas_size[1] // 2
-    draw.text((text_x, text_y), legend_text, fill="black", font=font)
+    draw.text((text_x, text_y), legend_text, fill=0, font=font)
     
     return img
 
-def create_docx_export(intro_paths, metadata, key_pages):
-    """Create DOCX version of the maze book"""
+def create_docx_export(intro_paths, metadata, key_pages, page_png=None):
+    """Create DOCX version of the maze book
+
+    page_png maps page paths to PNG bytes already in memory; those pages are embedded
+    from memory instead of being read back from disk.
+    """
+    page_png = page_png or {}
     if not DOCX_AVAILABLE:
         print("⚠️  python-docx not available, skipping DOCX export")
         return None
@@ -385,24 +490,24 @@ def create_docx_export(intro_paths, metadata, key_pages):
     
     # Add intro pages
     for intro_path in intro_paths:
-        doc.add_picture(intro_path, width=Inches(7.5))
+        doc.add_picture(_page_file(intro_path, page_png), width=Inches(7.5))
         doc.add_page_break()
     
     # Add maze pages
     for entry in metadata:
         if entry["has_key"]:
-            doc.add_picture(entry["image"], width=Inches(7.5))
+            doc.add_picture(_page_file(entry["image"], page_png), width=Inches(7.5))
             doc.add_page_break()
     
     # Add DIY pages
     for entry in metadata:
         if not entry["has_key"]:
-            doc.add_picture(entry["image"], width=Inches(7.5))
+            doc.add_picture(_page_file(entry["image"], page_png), width=Inches(7.5))
             doc.add_page_break()
     
     # Add key pages
     for key_page_path in key_pages:
-        doc.add_picture(key_page_path, width=Inches(7.5))
+        doc.add_picture(_page_file(key_page_path, page_png), width=Inches(7.5))
         if key_page_path != key_pages[-1]:  # Don't add break after last page
             doc.add_page_break()
     
@@ -452,6 +557,46 @@ def create_odt_export(intro_paths, metadata, key_pages):
     doc.save(odt_path)
     return odt_path
 
+# Page geometry for render workers, set once per process by _init_render_worker
+_RENDER_CTX = {}
+
+def _init_render_worker(canvas_size: Tuple[int, int], margin: int, dpi: int) -> None:
+    _RENDER_CTX.update(canvas_size=canvas_size, margin=margin, dpi=dpi)
+
+def _png_bytes(img: Image.Image, dpi: int) -> bytes:
+    buf = io.BytesIO()
+    img.save(buf, format="PNG", dpi=(dpi, dpi), compress_level=1, optimize=False)
+    return buf.getvalue()
+
+def _write_bytes(path: str, data: bytes) -> None:
+    with open(path, "wb") as f:
+        f.write(data)
+
+def _page_file(path: str, page_png: Dict[str, bytes]):
+    """The in-memory PNG for path as a file object if it was rendered this run, else path itself."""
+    png = page_png.get(path)
+    return io.BytesIO(png) if png is not None else path
+
+def render_one_maze(job: Tuple[str, int, int, int, int]) -> Tuple[bytes, bytes, bytes]:
+    """Render the puzzle page, full-size key and 4-up key tile for one maze as PNG bytes."""
+    _, puzzle_num, stage, grid_size, seed = job
+    canvas_size, margin = _RENDER_CTX["canvas_size"], _RENDER_CTX["margin"]
+    maze = Maze.create(grid_size, grid_size, seed)
+    maze_img = draw_maze_page(maze, puzzle_num, stage, canvas_size, margin)
+    key_img = draw_key_page(maze, puzzle_num, stage, canvas_size, margin)
+    tile_img = draw_key_page(maze, puzzle_num, stage, canvas_size, margin, target_size=key_tile_size(canvas_size))
+    dpi = _RENDER_CTX["dpi"]
+    return _png_bytes(maze_img, dpi), _png_bytes(key_img, dpi), _png_bytes(tile_img, dpi)
+
+def render_one_diy(page_num: int) -> bytes:
+    diy_img = draw_diy_page(page_num, _RENDER_CTX["canvas_size"], _RENDER_CTX["margin"])
+    return _png_bytes(diy_img, _RENDER_CTX["dpi"])
+
+def render_one_key_page(keys: List[Tuple[int, int, bytes]]) -> bytes:
+    """Render a 4-up key page from (puzzle_num, stage, key tile PNG bytes) entries."""
+    decoded = [(puzzle_num, stage, Image.open(io.BytesIO(png))) for puzzle_num, stage, png in keys]
+    return _png_bytes(create_4up_key_page(decoded, _RENDER_CTX["canvas_size"]), _RENDER_CTX["dpi"])
+
 def main():
     parser = argparse.ArgumentParser(description="Generate KDP Maze Book")
     parser.add_argument("--dpi", type=int, default=300)
@@ -500,13 +645,17 @@ def main():
     os.makedirs("output/compiled", exist_ok=True)
     os.makedirs("intro", exist_ok=True)
     
-    # Create intro pages if missing
+    page_png = {}  # output path -> PNG bytes of every page rendered this run
+    
+    # Create intro pages if missing; both are the same legend page, so render and encode it once
     intro1_path = "intro/intro_page1.png"
     intro2_path = "intro/intro_page2.png"
-    if not os.path.exists(intro1_path):
-        create_blank_intro_page(canvas_size).save(intro1_path, dpi=(args.dpi, args.dpi))
-    if not os.path.exists(intro2_path):
-        create_blank_intro_page(canvas_size).save(intro2_path, dpi=(args.dpi, args.dpi))
+    missing_intros = [path for path in (intro1_path, intro2_path) if not os.path.exists(path)]
+    if missing_intros:
+        intro_png = _png_bytes(create_blank_intro_page(canvas_size), args.dpi)
+        for path in missing_intros:
+            _write_bytes(path, intro_png)
+            page_png[path] = intro_png
     
     # Stage configurations: (count, grid_size, stage_num)
     stages = [
@@ -517,72 +666,78 @@ def main():
     ]
     
     metadata = []
-    maze_counter = 1
     all_keys = []
+    key_pages = []
     
-    # Generate mazes for stages 1-4
-    for count, grid_size, stage_num in stages:
-        for i in range(count):
-            maze_id = f"M{maze_counter:03d}"
-            maze = Maze.create(grid_size, grid_size, args.seed + maze_counter)
-            
-            # Create maze page with puzzle number
-            maze_img = draw_maze_page(maze, maze_counter, stage_num, canvas_size, margin_side)
+    # Every page is rendered independently in a worker process; the parent only writes the
+    # returned PNG bytes, so files are produced in the same order as a serial run
+    with ProcessPoolExecutor(max_workers=os.cpu_count(), initializer=_init_render_worker,
+                             initargs=(canvas_size, margin_side, args.dpi)) as pool:
+        # Generate mazes for stages 1-4
+        jobs = []
+        maze_counter = 1
+        for count, grid_size, stage_num in stages:
+            for i in range(count):
+                jobs.append((f"M{maze_counter:03d}", maze_counter, stage_num, grid_size, args.seed + maze_counter))
+                maze_counter += 1
+        
+        for (maze_id, puzzle_num, stage_num, grid_size, _), (maze_png, key_png, tile_png) in zip(
+                jobs, pool.map(render_one_maze, jobs)):
             maze_path = f"output/stage{stage_num}/{maze_id}.png"
-            maze_img.save(maze_path, dpi=(args.dpi, args.dpi))
-            
-            # Create key
-            key_img = draw_key_page(maze, maze_counter, stage_num, canvas_size, margin_side)
+            _write_bytes(maze_path, maze_png)
+            page_png[maze_path] = maze_png
             key_path = f"output/keys/{maze_id}_key.png"
-            key_img.save(key_path, dpi=(args.dpi, args.dpi))
+            _write_bytes(key_path, key_png)
             
-            all_keys.append((maze_counter, stage_num, key_img))
+            all_keys.append((puzzle_num, stage_num, tile_png))
             
             metadata.append({
                 "id": maze_id,
-                "puzzle_num": maze_counter,
+                "puzzle_num": puzzle_num,
                 "stage": stage_num,
                 "grid": f"{grid_size}x{grid_size}",
                 "has_key": True,
                 "image": maze_path,
                 "key": key_path
             })
+        
+        # Generate Stage 5 DIY pages
+        for i, diy_png in enumerate(pool.map(render_one_diy, range(1, args.s5 + 1))):
+            diy_id = f"D{i+1:02d}"
+            diy_path = f"output/stage5/{diy_id}.png"
+            _write_bytes(diy_path, diy_png)
+            page_png[diy_path] = diy_png
             
-            maze_counter += 1
-    
-    # Generate Stage 5 DIY pages
-    for i in range(args.s5):
-        diy_id = f"D{i+1:02d}"
-        diy_img = draw_diy_page(i+1, canvas_size, margin_side)
-        diy_path = f"output/stage5/{diy_id}.png"
-        diy_img.save(diy_path, dpi=(args.dpi, args.dpi))
+            metadata.append({
+                "id": diy_id,
+                "stage": 5,
+                "grid": "10x10",
+                "has_key": False,
+                "image": diy_path,
+                "key": None
+            })
         
-        metadata.append({
-            "id": diy_id,
-            "stage": 5,
-            "grid": "10x10",
-            "has_key": False,
-            "image": diy_path,
-            "key": None
-        })
-    
-    # Create 4-up key pages
-    key_pages = []
-    for i in range(0, len(all_keys), 4):
-        page_keys = all_keys[i:i+4]
-        key_page = create_4up_key_page(page_keys, canvas_size)
-        key_page_path = f"output/keypages/keys_page_{(i//4)+1:03d}.png"
-        key_page.save(key_page_path, dpi=(args.dpi, args.dpi))
-        key_pages.append(key_page_path)
+        # Create 4-up key pages
+        key_groups = [all_keys[i:i+4] for i in range(0, len(all_keys), 4)]
+        for i, key_page_png in enumerate(pool.map(render_one_key_page, key_groups)):
+            key_page_path = f"output/keypages/keys_page_{i+1:03d}.png"
+            _write_bytes(key_page_path, key_page_png)
+            page_png[key_page_path] = key_page_png
+            key_pages.append(key_page_path)
     
     # Post-generation marker verification
     print("\n🔍 Verifying markers on maze pages...")
-    missing_markers = []
-    for entry in metadata:
-        if entry["has_key"] and entry["stage"] <= 4:
-            # Simple check - could be enhanced to actually verify pixel content
-            if not os.path.exists(entry["image"]):
-                missing_markers.append(entry["id"])
+    checked = [entry for entry in metadata if entry["has_key"] and entry["stage"] <= 4]
+    # List each stage directory once instead of stat()ing every page
+    existing = set()
+    for folder in {os.path.dirname(entry["image"]) for entry in checked}:
+        try:
+            with os.scandir(folder) as it:
+                existing.update(f"{folder}/{e.name}" for e in it)
+        except FileNotFoundError:
+            pass
+    # Simple check - could be enhanced to actually verify pixel content
+    missing_markers = [entry["id"] for entry in checked if entry["image"] not in existing]
     
     if missing_markers:
         print(f"⚠️  Missing markers detected on: {', '.join(missing_markers)}")
@@ -599,24 +754,24 @@ def main():
     
     # Add intro pages
     for intro_path in [intro1_path, intro2_path]:
-        c.drawImage(intro_path, 0, 0, width=letter[0], height=letter[1])
+        c.drawImage(ImageReader(_page_file(intro_path, page_png)), 0, 0, width=letter[0], height=letter[1])
         c.showPage()
     
     # Add maze pages (M001-M072)
     for entry in metadata:
         if entry["has_key"]:
-            c.drawImage(entry["image"], 0, 0, width=letter[0], height=letter[1])
+            c.drawImage(ImageReader(_page_file(entry["image"], page_png)), 0, 0, width=letter[0], height=letter[1])
             c.showPage()
     
     # Add DIY pages
     for entry in metadata:
         if not entry["has_key"]:
-            c.drawImage(entry["image"], 0, 0, width=letter[0], height=letter[1])
+            c.drawImage(ImageReader(_page_file(entry["image"], page_png)), 0, 0, width=letter[0], height=letter[1])
             c.showPage()
     
     # Add key pages
     for key_page_path in key_pages:
-        c.drawImage(key_page_path, 0, 0, width=letter[0], height=letter[1])
+        c.drawImage(ImageReader(_page_file(key_page_path, page_png)), 0, 0, width=letter[0], height=letter[1])
         c.showPage()
     
     c.save()
@@ -635,7 +790,7 @@ def main():
     exports = [f"PDF: {pdf_path}"]
     
     if getattr(args, 'emit_docx', False):
-        docx_path = create_docx_export([intro1_path, intro2_path], metadata, key_pages)
+        docx_path = create_docx_export([intro1_path, intro2_path], metadata, key_pages, page_png)
         if docx_path:
             exports.append(f"DOCX: {docx_path}")
     
@@ -0,0 +1,133 @@
+from __future__ import absolute_import
+import random
+import unittest
+from collections import deque
+
+import numpy as np
+
+from src.make_kdp_maze_book import Maze, ALL_WALLS, N_BIT, S_BIT, E_BIT, W_BIT, _wall_array
+
+
+def reference_bfs(maze, start, goal):
+    """Plain deque/dict BFS, as the solver was written before it was vectorized."""
+    queue = deque([start])
+    came_from = {start: None}
+    while queue:
+        cur = queue.popleft()
+        if cur == goal:
+            break
+        for nb in maze.neighbors_open(cur):
+            if nb not in came_from:
+                came_from[nb] = cur
+                queue.append(nb)
+    if goal not in came_from:
+        return [goal]
+    path = []
+    cur = goal
+    while cur is not None:
+        path.append(cur)
+        cur = came_from[cur]
+    path.reverse()
+    return path
+
+
+def add_loops(maze, count, seed):
+    """Knock down count extra interior walls so the maze has cycles."""
+    rng = random.Random(seed)
+    for _ in range(count):
+        x = rng.randrange(maze.width)
+        y = rng.randrange(maze.height)
+        if x + 1 < maze.width and rng.random() < 0.5:
+            maze.walls[y, x] &= ALL_WALLS ^ E_BIT
+            maze.walls[y, x + 1] &= ALL_WALLS ^ W_BIT
+        elif y + 1 < maze.height:
+            maze.walls[y, x] &= ALL_WALLS ^ S_BIT
+            maze.walls[y + 1, x] &= ALL_WALLS ^ N_BIT
+    return maze
+
+
+def paint_walls_per_segment(maze, cell_size, wall_width, shade):
+    """Straightforward painter: one rectangle per wall bit, covering both corner squares."""
+    arr = np.full((maze.height * cell_size + wall_width, maze.width * cell_size + wall_width), 255,
+                  dtype=np.uint8)
+    for y in range(maze.height):
+        for x in range(maze.width):
+            left, top = x * cell_size, y * cell_size
+            walls = maze.walls[y, x]
+            if walls & N_BIT:
+                arr[top:top + wall_width, left:left + cell_size + wall_width] = shade
+            if walls & S_BIT:
+                arr[top + cell_size:top + cell_size + wall_width, left:left + cell_size + wall_width] = shade
+            if walls & W_BIT:
+                arr[top:top + cell_size + wall_width, left:left + wall_width] = shade
+            if walls & E_BIT:
+                arr[top:top + cell_size + wall_width, left + cell_size:left + cell_size + wall_width] = shade
+    return arr
+
+
+class TestKdpMazeSolver(unittest.TestCase):
+    def check_solver(self, maze, start=(0, 0), goal=None):
+        if goal is None:
+            goal = (maze.width - 1, maze.height - 1)
+        path = maze.solve_bfs(start, goal)
+        self.assertEqual(path[0], start)
+        self.assertEqual(path[-1], goal)
+        for a, b in zip(path, path[1:]):
+            self.assertIn(b, maze.neighbors_open(a))
+        self.assertEqual(len(path), len(reference_bfs(maze, start, goal)))
+
+    def test_perfect_mazes(self):
+        for width, height in ((1, 1), (2, 3), (10, 10), (15, 15)):
+            for seed in range(3):
+                self.check_solver(Maze.create(width, height, seed))
+
+    def test_mazes_with_loops(self):
+        for seed in range(5):
+            maze = add_loops(Maze.create(12, 9, seed), 30, seed)
+            self.check_solver(maze)
+            self.check_solver(maze, start=(5, 4), goal=(0, 8))
+
+    def test_start_is_goal(self):
+        maze = Maze.create(6, 4, 1)
+        self.assertEqual(maze.solve_bfs((2, 3), (2, 3)), [(2, 3)])
+
+    def test_non_square(self):
+        for width, height in ((7, 13), (13, 7), (1, 9), (9, 1)):
+            self.check_solver(Maze.create(width, height, 4))
+
+    def test_unreachable_goal(self):
+        maze = Maze(3, 3, np.full((3, 3), ALL_WALLS, dtype=np.uint8))
+        self.assertEqual(maze.solve_bfs(), [(2, 2)])
+
+
+class TestWallArray(unittest.TestCase):
+    def check(self, maze, cell_size, wall_width, shade):
+        np.testing.assert_array_equal(_wall_array(maze, cell_size, wall_width, shade),
+                                      paint_walls_per_segment(maze, cell_size, wall_width, shade))
+
+    def test_perfect_mazes(self):
+        for width, height in ((1, 1), (5, 5), (7, 13)):
+            for cell_size, wall_width in ((10, 1), (20, 2), (31, 4)):
+                self.check(Maze.create(width, height, width + cell_size), cell_size, wall_width, 0)
+
+    def test_mazes_with_loops(self):
+        # Loops leave corner squares with no wall on any side, which must be erased
+        for seed in range(3):
+            self.check(add_loops(Maze.create(9, 6, seed), 25, seed), 16, 3, 128)
+
+    def test_arbitrary_wall_bits(self):
+        # Walls stored on only one of the two cells that share them must still be drawn
+        rng = np.random.default_rng(0)
+        for width, height, cell_size, wall_width in ((4, 3, 12, 2), (6, 6, 9, 1), (3, 8, 25, 5)):
+            walls = rng.integers(0, ALL_WALLS + 1, (height, width)).astype(np.uint8)
+            self.check(Maze(width, height, walls), cell_size, wall_width, 0)
+
+    def test_template_is_not_modified(self):
+        maze = Maze.create(5, 5, 1)
+        first = _wall_array(maze, 12, 2, 0)
+        _wall_array(Maze.create(5, 5, 2), 12, 2, 0)
+        np.testing.assert_array_equal(_wall_array(maze, 12, 2, 0), first)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+from __future__ import absolute_import
+import random
+import unittest
+from unittest import mock
+
+import generate_kids_mazes as kids
+
+
+class TestKidsMaze(unittest.TestCase):
+    # The deque solver is the reference here; these cases target what is specific to this
+    # module: the numba bidirectional BFS and the (width, height) layout of walls
+
+    def solve_both(self, maze, start=(0, 0), goal=None):
+        with mock.patch.object(kids, "NUMBA_MIN_CELLS", float("inf")):
+            expected = maze.solve_bfs(start, goal)
+        if kids._numba_kernels() is None:
+            return expected, None
+        with mock.patch.object(kids, "NUMBA_MIN_CELLS", 0):
+            return expected, maze.solve_bfs(start, goal)
+
+    def check_numba_matches_deque(self, maze, start=(0, 0), goal=None):
+        if kids._numba_kernels() is None:
+            self.skipTest("numba is not installed")
+        expected, path = self.solve_both(maze, start, goal)
+        self.assertEqual((path[0], path[-1]), (expected[0], expected[-1]))
+        for a, b in zip(path, path[1:]):
+            self.assertIn(b, maze.neighbors_open(a))
+        self.assertEqual(len(path), len(expected))
+
+    def test_numba_matches_deque(self):
+        for width, height in ((1, 1), (10, 10), (7, 13), (13, 7)):
+            self.check_numba_matches_deque(kids.Maze.create(width, height, 3))
+        self.check_numba_matches_deque(kids.Maze.create(6, 4, 1), start=(2, 3), goal=(2, 3))
+
+    def test_numba_matches_deque_with_loops(self):
+        # Cycles are where the two searches of the bidirectional BFS can meet off the shortest path
+        rng = random.Random(0)
+        maze = kids.Maze.create(12, 9, 0)
+        for _ in range(30):
+            x, y = rng.randrange(maze.width - 1), rng.randrange(maze.height)
+            maze.walls[x, y] &= ~kids.E & 0xF
+            maze.walls[x + 1, y] &= ~kids.W & 0xF
+        self.check_numba_matches_deque(maze)
+        self.check_numba_matches_deque(maze, start=(5, 4), goal=(0, 8))
+
+    def test_axis_order(self):
+        # walls is indexed [x, y]: a 9x1 maze is one row and its path runs along x
+        maze = kids.Maze.create(9, 1, 5)
+        self.assertEqual(maze.walls.shape, (9, 1))
+        row = [(x, 0) for x in range(9)]
+        for path in self.solve_both(maze):
+            if path is not None:
+                self.assertEqual(path, row)
+
+    def assert_perfect(self, maze):
+        # A spanning tree of the grid: width * height - 1 passages, each seen from both ends,
+        # and every cell reachable from (0, 0)
+        opened = sum(len(maze.neighbors_open((x, y)))
+                     for x in range(maze.width) for y in range(maze.height))
+        self.assertEqual(opened, 2 * (maze.width * maze.height - 1))
+        seen = {(0, 0)}
+        stack = [(0, 0)]
+        while stack:
+            for nb in maze.neighbors_open(stack.pop()):
+                if nb not in seen:
+                    seen.add(nb)
+                    stack.append(nb)
+        self.assertEqual(len(seen), maze.width * maze.height)
+        # The outer border stays closed
+        walls = maze.walls
+        self.assertTrue((walls[0, :] & kids.W).all() and (walls[-1, :] & kids.E).all())
+        self.assertTrue((walls[:, 0] & kids.N).all() and (walls[:, -1] & kids.S).all())
+
+    def test_generated_maze_is_perfect(self):
+        maze = kids.Maze.create(8, 5, 2)
+        self.assertEqual(maze, kids.Maze.create(8, 5, 2))
+        self.assert_perfect(maze)
+
+    def test_numba_generated_maze_is_perfect(self):
+        if kids._numba_kernels() is None:
+            self.skipTest("numba is not installed")
+        with mock.patch.object(kids, "NUMBA_MIN_CELLS", 0):
+            for width, height in ((1, 1), (8, 5), (5, 8), (30, 30)):
+                maze = kids.Maze.create(width, height, 2)
+                self.assertEqual(maze.walls.shape, (width, height))
+                self.assertEqual(maze, kids.Maze.create(width, height, 2))
+                self.assert_perfect(maze)
+
+
+if __name__ == "__main__":
+    unittest.main()
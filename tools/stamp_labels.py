@@ -1,7 +1,13 @@
+import functools
 import glob
+import inspect
 import os
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw, ImageFilter, ImageFont
 
+# stroke_width/stroke_fill on ImageDraw.text only exist on modern Pillow; check once at import
+_HAS_STROKE = "stroke_width" in inspect.signature(ImageDraw.ImageDraw.text).parameters
+
+@functools.lru_cache(maxsize=32)
 def load_font(px: int):
     try:
         return ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", px)
@@ -11,19 +17,22 @@ def load_font(px: int):
 def draw_label(draw: ImageDraw.ImageDraw, xy, text, px, font):
     # black text with white outline for B/W print clarity
     stroke_w = max(2, px // 10)
-    # Pillow supports stroke_width/stroke_fill on modern versions
-    try:
+    if _HAS_STROKE:
         draw.text(xy, text, font=font, fill=(0,0,0),
                   stroke_width=stroke_w, stroke_fill=(255,255,255))
-    except TypeError:
-        # fallback manual stroke
-        x, y = xy
-        for dx in range(-stroke_w, stroke_w+1):
-            for dy in range(-stroke_w, stroke_w+1):
-                if dx == 0 and dy == 0:
-                    continue
-                draw.text((x+dx, y+dy), text, font=font, fill=(255,255,255))
-        draw.text((x, y), text, font=font, fill=(0,0,0))
+        return
+    # fallback manual stroke: render the text mask once and dilate it into the outline
+    x, y = xy
+    # measured as in stamp(); textbbox is Pillow 8+, textsize covers the older versions that get here
+    try:
+        _, _, right, bottom = draw.textbbox((0, 0), text, font=font)
+    except Exception:
+        right, bottom = draw.textsize(text, font=font)
+    mask = Image.new("L", (right + 2*stroke_w, bottom + 2*stroke_w), 0)
+    ImageDraw.Draw(mask).text((stroke_w, stroke_w), text, font=font, fill=255)
+    outline = mask.filter(ImageFilter.MaxFilter(2*stroke_w + 1))
+    draw.bitmap((x - stroke_w, y - stroke_w), outline, fill=(255,255,255))
+    draw.text((x, y), text, font=font, fill=(0,0,0))
 
 def stamp(path: str):
     img = Image.open(path).convert("RGB")
@@ -48,7 +57,7 @@ def stamp(path: str):
     draw_label(draw, start_xy, "START", px, font)
     draw_label(draw, finish_xy, "FINISH", px, font)
 
-    img.save(path, dpi=(300,300))
+    img.save(path, dpi=(300,300), compress_level=1, optimize=False)
 
 def main():
     outdir = "mazes_output"